@@ -13,9 +13,18 @@ async def generate_icebreaker(data: Icebreaker):
     """
     try:
         print("Received icebreaker request for:", data.name)
-        await enqueue_icebreaker_job(data.dict())  # Add await here
+        job = await enqueue_icebreaker_job(data.dict())  # Add await here
+        if job["deduplicated"]:
+            print("Icebreaker request already pending for:", data.name)
+            return {
+                "message": "Icebreaker request already pending, attached to existing job",
+                "job_id": job["job_id"]
+            }
         print("Successfully enqueued job for:", data.name)
-        return {"message": "Icebreaker request enqueued for background processing"}
+        return {
+            "message": "Icebreaker request enqueued for background processing",
+            "job_id": job["job_id"]
+        }
     except Exception as e:
         print("Error enqueuing icebreaker:", str(e))
         raise HTTPException(
@@ -14,11 +14,18 @@ async def handle_transcript(data: TranscriptPayload):
         print(f"Received transcript request for company: {data.company}")
         
         # Queue the job
-        await enqueue_transcript_job(data.dict())
+        job = await enqueue_transcript_job(data.dict())
+        if job["deduplicated"]:
+            print(f"Transcript request already pending for company: {data.company}")
+            return {
+                "message": "Transcript request already pending, attached to existing job",
+                "job_id": job["job_id"]
+            }
         print(f"Successfully queued job for company: {data.company}")
         
         return {
-            "message": "Transcript request queued successfully"
+            "message": "Transcript request queued successfully",
+            "job_id": job["job_id"]
         }
     except Exception as e:
         print("Error queueing transcript:", str(e))
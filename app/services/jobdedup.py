@@ -0,0 +1,142 @@
+# app/services/jobdedup.py
+
+import os
+import json
+import hashlib
+from uuid import uuid4
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPSTASH_URL = os.getenv("UPSTASH_REDIS_REST_URL")
+UPSTASH_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN")
+INFLIGHT_PREFIX = "inflight"
+INFLIGHT_TTL_SECONDS = int(os.getenv("INFLIGHT_TTL_SECONDS", "300"))
+
+if not UPSTASH_URL or not UPSTASH_TOKEN:
+    raise ValueError("Missing Upstash credentials. Please check your .env file.")
+
+# Claim the slot for a new job id, or hand back the id of the job already holding it
+CLAIM_SCRIPT = (
+    "if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then return ARGV[1] end "
+    "return redis.call('GET', KEYS[1])"
+)
+# Only touch the slot while it still belongs to the given job id
+REFRESH_SCRIPT = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('EXPIRE', KEYS[1], ARGV[2]) end "
+    "return 0"
+)
+RELEASE_SCRIPT = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end "
+    "return 0"
+)
+
+def fingerprint_job(queue_name: str, payload: dict) -> str:
+    """
+    Build a stable content fingerprint for a job on the given queue.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{queue_name}:{canonical}".encode("utf-8")).hexdigest()
+
+def _inflight_key(fingerprint: str) -> str:
+    return f"{INFLIGHT_PREFIX}:{fingerprint}"
+
+async def _run_command(session: aiohttp.ClientSession, command: list):
+    """Send a single Redis command to the Upstash REST endpoint."""
+    async with session.post(
+        UPSTASH_URL,
+        headers={
+            "Authorization": f"Bearer {UPSTASH_TOKEN}",
+            "Content-Type": "application/json"
+        },
+        json=command
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            print(f"Error from Upstash: {error_text}")
+            raise Exception(f"Upstash command {command[0]} failed: {error_text}")
+        data = await response.json()
+        return data.get("result")
+
+async def claim_inflight_job(session: aiohttp.ClientSession, fingerprint: str, job_id: str):
+    """
+    Claim the in-flight slot for a fingerprint under the given job id.
+    Returns the id of the job holding the slot, which is job_id itself
+    unless an identical job is already pending.
+    """
+    return await _run_command(
+        session,
+        ["EVAL", CLAIM_SCRIPT, "1", _inflight_key(fingerprint), job_id, INFLIGHT_TTL_SECONDS]
+    )
+
+async def refresh_inflight_job(fingerprint: str, job_id: str):
+    """
+    Push the in-flight slot's expiry out again when the worker picks the job up,
+    so the TTL only has to cover queue wait or processing time, not both.
+    """
+    if not fingerprint or not job_id:
+        return
+    try:
+        async with aiohttp.ClientSession() as session:
+            await _run_command(
+                session,
+                ["EVAL", REFRESH_SCRIPT, "1", _inflight_key(fingerprint), job_id, INFLIGHT_TTL_SECONDS]
+            )
+    except Exception as e:
+        print(f"Error refreshing in-flight job {job_id}: {str(e)}")
+
+async def release_inflight_job(fingerprint: str, job_id: str):
+    """
+    Release the in-flight slot so a later identical submission is enqueued again.
+    Does nothing if the slot has since been claimed by another job.
+    """
+    if not fingerprint or not job_id:
+        return
+    try:
+        async with aiohttp.ClientSession() as session:
+            await _run_command(
+                session,
+                ["EVAL", RELEASE_SCRIPT, "1", _inflight_key(fingerprint), job_id]
+            )
+    except Exception as e:
+        # The key expires on its own, so a failed release is not fatal
+        print(f"Error releasing in-flight job {job_id}: {str(e)}")
+
+async def enqueue_deduplicated(queue_name: str, payload: dict):
+    """
+    Push a job onto an Upstash Redis queue unless an identical one is pending.
+    Returns {"job_id", "deduplicated"}; duplicates get the pending job's id.
+    """
+    fingerprint = fingerprint_job(queue_name, payload)
+    job_id = uuid4().hex
+    async with aiohttp.ClientSession() as session:
+        try:
+            holder = await claim_inflight_job(session, fingerprint, job_id)
+        except BaseException:
+            # The claim may have landed even though we never saw the reply;
+            # compare-and-delete only removes it if it is ours
+            await release_inflight_job(fingerprint, job_id)
+            raise
+        if holder != job_id:
+            print(f"Job {holder} already pending on {queue_name}, skipping duplicate")
+            return {"job_id": holder, "deduplicated": True}
+
+        # Only a non-200 reply proves the push did not happen. On timeouts,
+        # dropped connections or cancellation the push may have been applied,
+        # so the slot is kept and cleared by the worker or the TTL instead;
+        # a retry in that window is attached to a job that may not exist.
+        async with session.post(
+            f"{UPSTASH_URL}/lpush/{queue_name}",
+            headers={
+                "Authorization": f"Bearer {UPSTASH_TOKEN}",
+                "Content-Type": "application/json"
+            },
+            json={"value": json.dumps({**payload, "job_id": job_id, "fingerprint": fingerprint})}
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Error from Upstash: {error_text}")
+                await release_inflight_job(fingerprint, job_id)
+                raise Exception(f"Failed to enqueue job: {error_text}")
+        return {"job_id": job_id, "deduplicated": False}
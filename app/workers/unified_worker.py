@@ -5,6 +5,7 @@ import aiohttp
 from dotenv import load_dotenv
 from app.services.ai_service import process_icebreaker, get_transcript_insight
 from app.services.supabase_service import save_icebreaker_result, save_transcript_result
+from app.services.jobdedup import refresh_inflight_job, release_inflight_job
 from app.schemas.icebreaker_schema import Icebreaker
 from app.schemas.transcript_schema import TranscriptPayload
 
@@ -146,12 +147,19 @@ async def worker():
                         continue
                         
                     print("📋 Parsed job data:", job)
+                    job_id = job.pop("job_id", None)
+                    fingerprint = job.pop("fingerprint", None)
+                    await refresh_inflight_job(fingerprint, job_id)
 
                     # Process based on queue type
-                    if queue_type == "icebreaker":
-                        await process_icebreaker_job(job)
-                    elif queue_type == "transcript":
-                        await process_transcript_job(job)
+                    try:
+                        if queue_type == "icebreaker":
+                            await process_icebreaker_job(job)
+                        elif queue_type == "transcript":
+                            await process_transcript_job(job)
+                    finally:
+                        # Let identical submissions through again once this one is done
+                        await release_inflight_job(fingerprint, job_id)
 
             # Wait a bit before checking queues again
             await asyncio.sleep(2)